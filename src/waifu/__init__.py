@@ -4,13 +4,15 @@ from .enhanced import EnhancedWaifuAssistant
 from .storage import StorageManager
 from .ui import UIManager
 from .config import Config
+from .index import ProjectIndex
 
 __all__ = [
     'WaifuAssistant',
     'EnhancedWaifuAssistant',
     'StorageManager',
     'UIManager',
-    'Config'
+    'Config',
+    'ProjectIndex'
 ]
 
 # Version info
@@ -38,6 +38,24 @@ class WaifuAssistant:
         self.storage.save_chat_history(chat_history)
         return assistant_reply
 
+    def generate_comment(self, context: str) -> str:
+        """Generates a one-off response without reading or saving chat history."""
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": context}
+            ]
+        )
+        return response.choices[0].message.content or ""
+
+    def record_comment(self, context: str, reply: str) -> None:
+        """Adds a prompt and a reply generated earlier to the chat history."""
+        chat_history = self.get_chat_history()
+        chat_history.append({"role": "user", "content": context})
+        chat_history.append({"role": "assistant", "content": reply})
+        self.storage.save_chat_history(chat_history)
+
     async def notify(self, message: str) -> None:
         """Sends a notification to the user."""
         print(f"\n{message}\n")
@@ -0,0 +1,360 @@
+"""Tab completion for chat commands and project paths."""
+import os
+import bisect
+import readline
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
+from watchdog.events import FileSystemEventHandler
+from .index import SKIP_DIRS, is_broad_root
+
+COMMANDS = ["!review", "!review-dir", "exit", "quit"]
+PATH_COMMANDS = ("!review", "!review-dir")
+# Bounds on filesystem watching; past these the trie is rebuilt periodically instead
+MAX_WATCHES = 64
+MAX_WATCHED_DIRS = 10000
+REBUILD_INTERVAL = 60
+
+
+def is_ignored(name: str) -> bool:
+    """Returns True for directories that are neither indexed nor watched."""
+    return name.startswith(".") or name in SKIP_DIRS
+
+
+class TrieNode:
+    """A directory in the path trie; files are children without a node."""
+    __slots__ = ("children", "_sorted")
+
+    def __init__(self):
+        self.children: Dict[str, Optional["TrieNode"]] = {}
+        self._sorted: Optional[List[str]] = None
+
+    def names(self) -> List[str]:
+        """Returns child names in sorted order, cached until the next change."""
+        if self._sorted is None:
+            self._sorted = sorted(self.children)
+        return self._sorted
+
+    def set_child(self, name: str, node: Optional["TrieNode"]) -> None:
+        """Adds or replaces a child entry."""
+        if name not in self.children:
+            self._sorted = None
+        self.children[name] = node
+
+    def remove_child(self, name: str) -> None:
+        """Removes a child entry if present."""
+        if self.children.pop(name, False) is not False:
+            self._sorted = None
+
+
+class PathTrie:
+    """Prefix trie over the path components of a directory tree."""
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.node = TrieNode()
+        self.directory_count = 0
+        self.pruned_dirs: List[str] = []
+
+    def build(self) -> None:
+        """Walks the tree and records every directory and file under the root."""
+        nodes = {self.root: self.node}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            node = nodes.pop(dirpath)
+            self.directory_count += 1
+            kept = [d for d in dirnames if not is_ignored(d)]
+            if len(kept) != len(dirnames):
+                self.pruned_dirs.append(dirpath)
+            dirnames[:] = kept
+            for dirname in dirnames:
+                child = TrieNode()
+                node.children[dirname] = child
+                nodes[os.path.join(dirpath, dirname)] = child
+            for filename in filenames:
+                node.children[filename] = None
+            node.names()  # Sort now, in the background, rather than on first Tab
+
+    def _parts(self, path: str, is_directory: bool = False) -> Optional[List[str]]:
+        """Splits an absolute path into components relative to the root."""
+        rel_path = os.path.relpath(os.path.abspath(path), self.root)
+        if rel_path == os.curdir or rel_path.startswith(os.pardir):
+            return None
+        parts = rel_path.split(os.sep)
+        directories = parts if is_directory else parts[:-1]
+        if any(is_ignored(part) for part in directories):
+            return None
+        return parts
+
+    def watch_plan(self) -> List[Tuple[str, bool]]:
+        """Returns (path, recursive) watches covering the tree but no ignored dirs."""
+        # Directories on the way to an ignored one must be watched non-recursively
+        dirty = set()
+        for path in self.pruned_dirs:
+            while path not in dirty:
+                dirty.add(path)
+                if path == self.root:
+                    break
+                path = os.path.dirname(path)
+
+        plan = []
+        pending = [(self.root, self.node)]
+        while pending:
+            path, node = pending.pop()
+            if path not in dirty:
+                plan.append((path, True))
+                continue
+            plan.append((path, False))
+            for name, child in node.children.items():
+                if child is not None:
+                    pending.append((os.path.join(path, name), child))
+        return plan
+
+    def add(self, path: str, is_directory: bool) -> None:
+        """Inserts a path, creating any missing parent directories."""
+        parts = self._parts(path, is_directory)
+        if not parts:
+            return
+        node = self.node
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = TrieNode()
+                node.set_child(part, child)
+            node = child
+        if is_directory:
+            if node.children.get(parts[-1]) is None:
+                node.set_child(parts[-1], TrieNode())
+        else:
+            node.set_child(parts[-1], None)
+
+    def remove(self, path: str) -> None:
+        """Removes a path and, for directories, everything beneath it."""
+        parts = self._parts(path)
+        if not parts:
+            return
+        node = self.node
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                return
+            node = child
+        node.remove_child(parts[-1])
+
+    def complete(self, prefix: str) -> List[str]:
+        """Returns root-relative paths starting with prefix; directories end in '/'."""
+        head, _, partial = prefix.rpartition("/")
+        node = self.node
+        for part in head.split("/") if head else []:
+            if part in ("", os.curdir):
+                continue
+            child = node.children.get(part)
+            if child is None:
+                return []
+            node = child
+        names = node.names()
+        start = bisect.bisect_left(names, partial)
+        end = bisect.bisect_left(names, partial + "\uffff", lo=start)
+        base = f"{head}/" if head else ""
+        return [
+            f"{base}{name}/" if node.children[name] is not None else f"{base}{name}"
+            for name in names[start:end]
+        ]
+
+
+class PathTrieHandler(FileSystemEventHandler):
+    """Keeps a completer's path trie in sync with filesystem events."""
+    def __init__(self, completer: "Completer"):
+        self.completer = completer
+
+    def on_created(self, event):
+        if event.is_directory and is_ignored(os.path.basename(event.src_path)):
+            return
+        self.completer.add_path(event.src_path, event.is_directory)
+        if event.is_directory:
+            self.completer.watch_new_directory(event.src_path)
+            self.completer.add_tree(event.src_path)
+
+    def on_deleted(self, event):
+        self.completer.remove_path(event.src_path)
+
+    def on_moved(self, event):
+        self.completer.remove_path(event.src_path)
+        if event.is_directory and is_ignored(os.path.basename(event.dest_path)):
+            return
+        self.completer.add_path(event.dest_path, event.is_directory)
+        if event.is_directory:
+            self.completer.watch_new_directory(event.dest_path)
+            self.completer.add_tree(event.dest_path)
+
+
+class Completer:
+    """Readline completer for chat commands and !review paths."""
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or os.getcwd())
+        self.trie: Optional[PathTrie] = None
+        self.observer: Optional[BaseObserver] = None
+        self.matches: List[str] = []
+        self._lock = threading.Lock()
+        # Events are queued while a trie is being built, then replayed onto it
+        self._rebuilding = True
+        self._pending: List[tuple] = []
+        self._flat_watches: Set[str] = set()
+        self._stopped = threading.Event()
+
+    def should_index(self) -> bool:
+        """Returns False for roots too broad to index, such as $HOME or /."""
+        return not is_broad_root(self.root)
+
+    def start(self) -> None:
+        """Builds the path trie in the background and keeps it up to date."""
+        if self.should_index():
+            threading.Thread(target=self._build, daemon=True).start()
+
+    def _build(self) -> None:
+        """Builds the trie, then keeps it current by watching or by periodic rebuilds."""
+        self._publish(self._scan())
+        if self._watch(self.trie):
+            # Changes made during the first walk were not watched yet; rescan once
+            self._rebuild()
+            return
+        while not self._stopped.wait(REBUILD_INTERVAL):
+            self._rebuild()
+
+    def _scan(self) -> PathTrie:
+        """Walks the root into a fresh trie."""
+        trie = PathTrie(self.root)
+        trie.build()
+        return trie
+
+    def _rebuild(self) -> None:
+        """Builds a replacement trie, queueing events that arrive meanwhile."""
+        with self._lock:
+            self._rebuilding = True
+            self._pending = []
+        self._publish(self._scan())
+
+    def _publish(self, trie: PathTrie) -> None:
+        """Replays queued events onto a freshly built trie and swaps it in."""
+        with self._lock:
+            for action, path, is_directory in self._pending:
+                if action == "add":
+                    trie.add(path, is_directory)
+                else:
+                    trie.remove(path)
+            self._pending = []
+            self._rebuilding = False
+            self.trie = trie
+
+    def _watch(self, trie: Optional[PathTrie]) -> bool:
+        """Watches the indexed tree, skipping ignored dirs. Returns False past the bounds."""
+        if trie is None:
+            return False
+        plan = trie.watch_plan()
+        if len(plan) > MAX_WATCHES or trie.directory_count > MAX_WATCHED_DIRS:
+            return False
+        observer = Observer()
+        observer.daemon = True
+        handler = PathTrieHandler(self)
+        try:
+            for path, recursive in plan:
+                observer.schedule(handler, path, recursive=recursive)
+                if not recursive:
+                    self._flat_watches.add(path)
+            observer.start()
+        except OSError:
+            # Typically inotify's max_user_watches; fall back to periodic rebuilds
+            self._flat_watches.clear()
+            observer.stop()
+            return False
+        self.observer = observer
+        return True
+
+    def watch_new_directory(self, path: str) -> None:
+        """Watches a directory created under a non-recursively watched one."""
+        observer = self.observer
+        if observer is None or os.path.dirname(path) not in self._flat_watches:
+            return
+        try:
+            observer.schedule(PathTrieHandler(self), path, recursive=True)
+        except OSError:
+            pass
+
+    def stop(self) -> None:
+        """Stops the filesystem observer and any periodic rebuilds."""
+        self._stopped.set()
+        observer, self.observer = self.observer, None
+        if observer:
+            observer.stop()
+            observer.join(timeout=1)
+
+    def add_path(self, path: str, is_directory: bool) -> None:
+        """Records a created path."""
+        with self._lock:
+            if self.trie is not None:
+                self.trie.add(path, is_directory)
+            if self._rebuilding:
+                self._pending.append(("add", path, is_directory))
+
+    def add_tree(self, path: str) -> None:
+        """Records a directory's existing contents, e.g. after it was moved in."""
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [d for d in dirnames if not is_ignored(d)]
+            for dirname in dirnames:
+                self.add_path(os.path.join(dirpath, dirname), True)
+            for filename in filenames:
+                self.add_path(os.path.join(dirpath, filename), False)
+
+    def remove_path(self, path: str) -> None:
+        """Records a deleted path."""
+        with self._lock:
+            if self.trie is not None:
+                self.trie.remove(path)
+            if self._rebuilding:
+                self._pending.append(("remove", path, False))
+
+    def complete_path(self, text: str) -> List[str]:
+        """Completes a path, using the trie for project-relative paths."""
+        bracket = "[" if text.startswith("[") else ""
+        text = text[len(bracket):]
+        outside = text.startswith(("/", "~")) or text.split("/")[0] == os.pardir
+        matches = []
+        if self.trie is not None and not outside:
+            with self._lock:
+                matches = self.trie.complete(text)
+        if not matches:
+            # Nothing indexed (yet), or outside the project: ask the filesystem
+            matches = self._complete_from_disk(text)
+        return [bracket + match for match in matches]
+
+    def _complete_from_disk(self, text: str) -> List[str]:
+        """Completes a path by listing its directory."""
+        head, _, partial = text.rpartition("/")
+        if head:
+            directory = os.path.join(self.root, os.path.expanduser(head))
+        else:
+            directory = "/" if text.startswith("/") else self.root
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return []
+        base = f"{head}/" if head or text.startswith("/") else ""
+        return [
+            f"{base}{name}/" if os.path.isdir(os.path.join(directory, name)) else f"{base}{name}"
+            for name in names if name.startswith(partial)
+        ]
+
+    def candidates(self, line: str, begidx: int, text: str) -> List[str]:
+        """Returns completion candidates for the word being typed."""
+        if not line[:begidx].strip():
+            return [command for command in COMMANDS if command.startswith(text)]
+        if line.lstrip().split()[0] in PATH_COMMANDS:
+            return self.complete_path(text)
+        return []
+
+    def complete(self, text: str, state: int) -> Optional[str]:
+        """Readline completer callback."""
+        if state == 0:
+            self.matches = self.candidates(
+                readline.get_line_buffer(), readline.get_begidx(), text
+            )
+        return self.matches[state] if state < len(self.matches) else None
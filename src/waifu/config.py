@@ -17,6 +17,10 @@ class Config:
         self.github_token = os.getenv("GITHUB_TOKEN")
         self.voice_enabled = os.getenv("VOICE_ENABLED", "false").lower() == "true"
         self.theme = os.getenv("THEME", "kawaii")
+        try:
+            self.greeting_ttl_hours = float(os.getenv("GREETING_TTL_HOURS", "12"))
+        except ValueError:
+            self.greeting_ttl_hours = 12.0
 
     def validate(self) -> None:
         """Validates that required environment variables are set."""
@@ -1,10 +1,12 @@
 """Enhanced features for the waifu assistant."""
 from typing import List, Dict, Optional, Any
+import os
 from datetime import datetime
 from io import StringIO
 from .base import WaifuAssistant
 from .storage import StorageManager
 from .ui import UIManager
+from .index import ProjectIndex, find_project_root
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from colorama import Fore, Style
@@ -33,7 +35,32 @@ class EnhancedWaifuAssistant(WaifuAssistant):
     def __init__(self, openai_client, storage_manager, ui_manager):
         super().__init__(openai_client, storage_manager, ui_manager)
         self.mood = Mood()  # Initialize mood
-        
+        self.project_indexes: Dict[str, ProjectIndex] = {}
+
+    def get_project_index(self, file_path: str) -> ProjectIndex:
+        """Returns the symbol index for a file's project, refreshing it once per session."""
+        root = find_project_root(file_path)
+        recursive = root is not None
+        if root is None:
+            # Outside any project (e.g. a script in $HOME): only index its own directory
+            root = os.path.dirname(os.path.abspath(file_path))
+        if root not in self.project_indexes:
+            index = ProjectIndex(root, self.storage.get_index_file(root), recursive)
+            index.refresh()
+            index.save()
+            self.project_indexes[root] = index
+        return self.project_indexes[root]
+
+    def get_review_context(self, file_path: str) -> str:
+        """Returns signatures of project symbols used by a file, or "" if unavailable."""
+        try:
+            index = self.get_project_index(file_path)
+            context = index.context_for(file_path)
+            index.save()
+            return context
+        except Exception:
+            return ""
+
     def review_file(self, file_path: str) -> None:
         """Review a single Python file."""
         try:
@@ -56,11 +83,17 @@ class EnhancedWaifuAssistant(WaifuAssistant):
             reporter = JSONReporter()
             Run([file_path], reporter=reporter, exit=False)
             
-            # Get AI review
+            # Get AI review, with signatures of the project symbols this file uses
             review_prompt = (
                 f"Review this Python file as a cute anime waifu assistant. "
                 f"Be constructive and encouraging, but also point out areas for improvement: {code}"
             )
+            context = self.get_review_context(file_path)
+            if context:
+                review_prompt += (
+                    f"\n\nFor reference, these are the signatures of project symbols "
+                    f"this file uses:\n{context}"
+                )
             ai_review = self.waifu_ai_comment(review_prompt)
             print(f"\n{Fore.YELLOW}AI Review:{Style.RESET_ALL}")
             print(ai_review)
@@ -0,0 +1,340 @@
+"""Project symbol index for cross-file code review context."""
+import os
+import ast
+import json
+import hashlib
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
+
+INDEX_VERSION = 1
+SKIP_DIRS = {"__pycache__", "node_modules", "venv", "env", "build", "dist"}
+PROJECT_MARKERS = ("pyproject.toml", "setup.py", "setup.cfg", ".git")
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+DefinitionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]
+
+
+def is_broad_root(path: str) -> bool:
+    """Returns True for directories too broad to walk, such as $HOME or /."""
+    broad = {os.path.abspath(os.sep), os.path.abspath(os.path.expanduser("~"))}
+    return os.path.abspath(path) in broad
+
+
+def find_project_root(file_path: str) -> Optional[str]:
+    """Walks up from a file to the nearest project root, or None if there isn't one."""
+    current = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        if any(os.path.exists(os.path.join(current, marker)) for marker in PROJECT_MARKERS):
+            # A dotfiles repo in $HOME is not a project worth walking
+            return None if is_broad_root(current) else current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _first_line(text: Optional[str]) -> str:
+    """Returns the first non-empty line of a docstring."""
+    if not text:
+        return ""
+    for line in text.strip().splitlines():
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+def _function_signature(node: FunctionNode) -> str:
+    """Renders a function definition header without its body."""
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    signature = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        signature += f" -> {ast.unparse(node.returns)}"
+    return signature
+
+
+def _class_signature(node: ast.ClassDef) -> str:
+    """Renders a class definition header without its body."""
+    bases = [ast.unparse(base) for base in node.bases]
+    bases += [ast.unparse(keyword) for keyword in node.keywords]
+    return f"class {node.name}({', '.join(bases)})" if bases else f"class {node.name}"
+
+
+def _symbol(signature: str, node: DefinitionNode) -> Dict[str, Any]:
+    """Builds the stored record for a single definition."""
+    return {
+        "signature": signature,
+        "doc": _first_line(ast.get_docstring(node)),
+        "line": node.lineno,
+    }
+
+
+def extract_symbols(tree: ast.Module) -> Dict[str, Dict[str, Any]]:
+    """Extracts top-level functions, classes and their methods from a module."""
+    symbols = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols[node.name] = _symbol(_function_signature(node), node)
+        elif isinstance(node, ast.ClassDef):
+            symbols[node.name] = _symbol(_class_signature(node), node)
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols[f"{node.name}.{child.name}"] = _symbol(
+                        _function_signature(child), child
+                    )
+    return symbols
+
+
+def extract_imports(tree: ast.Module) -> List[Dict[str, Any]]:
+    """Extracts import statements as (module, name, alias, level) records."""
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append({
+                    "module": alias.name,
+                    "name": None,
+                    "alias": alias.asname or alias.name.split(".")[0],
+                    "level": 0,
+                })
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                imports.append({
+                    "module": node.module or "",
+                    "name": alias.name,
+                    "alias": alias.asname or alias.name,
+                    "level": node.level,
+                })
+    return imports
+
+
+def _used_names(tree: ast.Module) -> Tuple[Set[str], Set[str]]:
+    """Returns the bare names and attribute names referenced in a module."""
+    names, attributes = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            attributes.add(node.attr)
+    return names, attributes
+
+
+class ProjectIndex:
+    """Persistent, incrementally maintained index of a project's Python symbols."""
+    def __init__(self, root: str, index_file: str, recursive: bool = True):
+        self.root = os.path.abspath(root)
+        self.index_file = index_file
+        self.recursive = recursive
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.modules: Dict[str, str] = {}
+        self.dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Loads a previously saved index from disk, if it matches this root."""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("root") != self.root:
+            return
+        if data.get("recursive", True) != self.recursive:
+            return
+        self.files = data.get("files", {})
+        self._rebuild_module_map()
+
+    def save(self) -> None:
+        """Writes the index to disk when it has changed since the last save."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "root": self.root,
+                "recursive": self.recursive,
+                "files": self.files,
+            }, f)
+        os.replace(tmp_file, self.index_file)
+        self.dirty = False
+
+    def _rebuild_module_map(self) -> None:
+        """Rebuilds the dotted module name to relative path lookup."""
+        self.modules = {entry["module"]: rel for rel, entry in self.files.items()}
+
+    def _module_name(self, rel_path: str) -> str:
+        """Derives a dotted module name from a path relative to the root."""
+        parts = rel_path[:-3].split(os.sep)
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        if parts and parts[0] == "src":
+            parts = parts[1:]
+        return ".".join(parts)
+
+    def _iter_python_files(self):
+        """Yields every Python file under the root, skipping hidden and build dirs."""
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [
+                d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+            ] if self.recursive else []
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    yield os.path.join(dirpath, filename)
+
+    def refresh(self) -> int:
+        """Re-indexes changed files and drops deleted ones. Returns files rebuilt."""
+        seen = set()
+        rebuilt = 0
+        for path in self._iter_python_files():
+            seen.add(os.path.relpath(path, self.root))
+            if self.update_file(path):
+                rebuilt += 1
+        for rel_path in set(self.files) - seen:
+            del self.files[rel_path]
+            self.dirty = True
+        self._rebuild_module_map()
+        return rebuilt
+
+    def update_file(self, path: str) -> bool:
+        """Re-indexes a single file if its mtime and content hash changed."""
+        path = os.path.abspath(path)
+        rel_path = os.path.relpath(path, self.root)
+        if rel_path.startswith(os.pardir) or not path.endswith(".py"):
+            return False
+        if not self.recursive and os.path.dirname(rel_path):
+            return False
+        try:
+            stat = os.stat(path)
+            entry = self.files.get(rel_path)
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return False
+            with open(path, 'rb') as f:
+                source = f.read()
+        except OSError:
+            # Deleted or unreadable; either way it contributes no symbols
+            self.remove_file(path)
+            return False
+        digest = hashlib.sha1(source).hexdigest()
+        if entry and entry["hash"] == digest:
+            # Touched but unchanged; remember the new mtime so we skip it next time
+            entry["mtime"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self.dirty = True
+            return False
+
+        try:
+            tree = ast.parse(source, filename=path)
+            symbols, imports = extract_symbols(tree), extract_imports(tree)
+        except (SyntaxError, ValueError):
+            symbols, imports = {}, []
+
+        module = self._module_name(rel_path)
+        self.files[rel_path] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": digest,
+            "module": module,
+            "package": os.path.basename(path) == "__init__.py",
+            "symbols": symbols,
+            "imports": imports,
+        }
+        self.modules[module] = rel_path
+        self.dirty = True
+        return True
+
+    def remove_file(self, path: str) -> bool:
+        """Drops a deleted file from the index."""
+        rel_path = os.path.relpath(os.path.abspath(path), self.root)
+        entry = self.files.pop(rel_path, None)
+        if entry is None:
+            return False
+        self.modules.pop(entry["module"], None)
+        self.dirty = True
+        return True
+
+    def _resolve_module(self, importer: Dict[str, Any], record: Dict[str, Any]) -> str:
+        """Resolves a (possibly relative) import to an absolute dotted module name."""
+        if not record["level"]:
+            return record["module"]
+        parts = importer["module"].split(".") if importer["module"] else []
+        # A package's own __init__ counts as the first level
+        drop = record["level"] - 1 if importer["package"] else record["level"]
+        base = parts[:len(parts) - drop] if drop else parts
+        if record["module"]:
+            base = base + record["module"].split(".")
+        return ".".join(base)
+
+    def _lookup_module(self, module: str) -> Optional[Dict[str, Any]]:
+        """Finds an indexed module by name, re-checking it for changes first."""
+        rel_path = self.modules.get(module)
+        if rel_path is None:
+            return None
+        self.update_file(os.path.join(self.root, rel_path))
+        rel_path = self.modules.get(module)
+        return self.files.get(rel_path) if rel_path else None
+
+    def context_for(self, file_path: str) -> str:
+        """Returns signatures of the project symbols a file actually uses."""
+        self.update_file(file_path)
+        rel_path = os.path.relpath(os.path.abspath(file_path), self.root)
+        entry = self.files.get(rel_path)
+        if entry is None:
+            return ""
+        with open(file_path, 'r') as f:
+            try:
+                tree = ast.parse(f.read())
+            except SyntaxError:
+                return ""
+        names, attributes = _used_names(tree)
+
+        wanted_by_module: Dict[str, Set[str]] = {}
+        targets: Dict[str, Dict[str, Any]] = {}
+        for record in entry["imports"]:
+            module_name = self._resolve_module(entry, record)
+            target = self._lookup_module(module_name)
+            if record["name"] is None:
+                # `import pkg.mod` - only attributes accessed on the alias matter
+                wanted = attributes if record["alias"] in names else set()
+            elif record["name"] == "*":
+                wanted = names
+            elif target is None or record["name"] not in target["symbols"]:
+                # `from pkg import module` imports a submodule, not a symbol
+                submodule = ".".join(part for part in (module_name, record["name"]) if part)
+                target = self._lookup_module(submodule)
+                wanted = attributes if record["alias"] in names else set()
+            else:
+                wanted = {record["name"]} if record["alias"] in names else set()
+            if target is None or not wanted:
+                continue
+            targets[target["module"]] = target
+            wanted_by_module.setdefault(target["module"], set()).update(wanted)
+
+        lines = []
+        for module_name, wanted in wanted_by_module.items():
+            section = self._render_symbols(targets[module_name]["symbols"], wanted, attributes)
+            if section:
+                lines.append(f"# {module_name}")
+                lines.extend(section)
+        return "\n".join(lines)
+
+    def _render_symbols(
+        self, symbols: Dict[str, Dict[str, Any]], wanted: Set[str], attributes: Set[str]
+    ) -> List[str]:
+        """Formats the requested symbols and the methods of them the file calls."""
+        lines = []
+        for name, symbol in symbols.items():
+            owner, _, method = name.partition(".")
+            if method:
+                if owner not in wanted or method not in attributes:
+                    continue
+                text = f"    {symbol['signature']}"
+            elif name in wanted:
+                text = symbol["signature"]
+            else:
+                continue
+            if symbol["doc"]:
+                text += f"  # {symbol['doc']}"
+            lines.append(text)
+        return lines
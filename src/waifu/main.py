@@ -4,7 +4,9 @@ from .config import Config
 from .storage import StorageManager
 from .ui import UIManager
 from .enhanced import EnhancedWaifuAssistant
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, Optional, TypeGuard
+import threading
 import colorama
 from colorama import Fore, Style
 import os
@@ -12,6 +14,10 @@ import os
 # Initialize colorama
 colorama.init()
 
+# Seconds waiting on input before precomputing greetings, and the most exit waits on it
+GREETING_IDLE_DELAY = 5
+GREETING_EXIT_TIMEOUT = 2
+
 def initialize_user_data(storage_manager: StorageManager) -> dict:
     """Initialize or load user data with default values."""
     user_data = storage_manager.load_user_data()
@@ -31,6 +37,119 @@ def user_never_used_waifu(storage_manager: StorageManager) -> bool:
     # Check if the user_file exists instead of checking the data
     return not os.path.exists(storage_manager.user_file)
 
+def welcome_back_prompts(user_data: dict) -> Dict[str, str]:
+    """Welcome-back prompts that depend only on stored user data."""
+    return {
+        "location": (
+            f"Make a timely remark about the user's location {user_data['location']}. Keep it brief!"
+        ),
+        "new_goals": (
+            "Make a brief quip about setting new goals. Then joke about living in the terminal."
+        ),
+    }
+
+def precompute_greetings(waifu: EnhancedWaifuAssistant, storage_manager: StorageManager, user_data: dict) -> None:
+    """Generates the next session's welcome-back greetings and stores each as it is ready."""
+    for key, prompt in welcome_back_prompts(user_data).items():
+        try:
+            text = waifu.generate_comment(prompt)
+        except Exception:
+            continue
+        greetings = storage_manager.load_greetings()
+        greetings[key] = {
+            "prompt": prompt,
+            "text": text,
+            "created": datetime.now().isoformat()
+        }
+        storage_manager.save_greetings(greetings)
+
+def is_fresh_greeting(cached: Optional[dict], prompt: str, ttl_hours: float) -> TypeGuard[dict]:
+    """Checks that a stored greeting matches the prompt and is younger than the TTL."""
+    if not cached or cached.get("prompt") != prompt or "text" not in cached:
+        return False
+    try:
+        age = datetime.now() - datetime.fromisoformat(cached["created"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return age < timedelta(hours=ttl_hours)
+
+class GreetingScheduler:
+    """Precomputes next session's greetings while the chat is idle, or at exit."""
+    def __init__(self, waifu: EnhancedWaifuAssistant, storage_manager: StorageManager, user_data: dict, ttl_hours: float, idle_delay: float = GREETING_IDLE_DELAY):
+        self.waifu = waifu
+        self.storage = storage_manager
+        self.user_data = user_data
+        self.ttl_hours = ttl_hours
+        self.idle_delay = idle_delay
+        self.session_start = datetime.now()
+        self.timer: Optional[threading.Timer] = None
+        self.running: Optional[threading.Thread] = None
+
+    def is_current(self) -> bool:
+        """Checks that every greeting is stored, fresh, and generated this session."""
+        greetings = self.storage.load_greetings()
+        for key, prompt in welcome_back_prompts(self.user_data).items():
+            cached = greetings.get(key)
+            if not is_fresh_greeting(cached, prompt, self.ttl_hours):
+                return False
+            if datetime.fromisoformat(cached["created"]) < self.session_start:
+                return False
+        return True
+
+    def _run(self) -> None:
+        """Precomputes greetings unless this session already has."""
+        self.running = threading.current_thread()
+        try:
+            if not self.is_current():
+                precompute_greetings(self.waifu, self.storage, dict(self.user_data))
+        except Exception:
+            pass
+
+    def idle(self) -> None:
+        """Called when waiting on input; precomputes if nothing arrives for a while."""
+        self.busy()
+        if self.running is not None and self.running.is_alive():
+            return
+        self.timer = threading.Timer(self.idle_delay, self._run)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def busy(self) -> None:
+        """Called when input arrives; cancels a precompute that has not started."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+    def finish(self, timeout: float = GREETING_EXIT_TIMEOUT) -> bool:
+        """Makes sure greetings reflect this session, waiting at most timeout seconds.
+
+        Returns False if the precompute did not finish in time; it is then dropped.
+        """
+        self.busy()
+        thread = self.running
+        if thread is None or not thread.is_alive():
+            if self.is_current():
+                return True
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+        try:
+            thread.join(timeout)
+        except KeyboardInterrupt:
+            pass
+        return not thread.is_alive()
+
+def get_greeting(waifu: EnhancedWaifuAssistant, storage_manager: StorageManager, key: str, prompt: str, ttl_hours: float) -> str:
+    """Returns a stored greeting if it is fresh and still matches, else asks the model."""
+    greetings = storage_manager.load_greetings()
+    cached: Optional[dict] = greetings.pop(key, None)
+    if cached is not None:
+        # Each greeting is shown at most once; stale ones are dropped too
+        storage_manager.save_greetings(greetings)
+    if cached is not None and is_fresh_greeting(cached, prompt, ttl_hours):
+        waifu.record_comment(prompt, cached["text"])
+        return cached["text"]
+    return waifu.waifu_ai_comment(prompt)
+
 def welcome_message(waifu: EnhancedWaifuAssistant, storage_manager: StorageManager, ui_manager: UIManager) -> dict:
     """Original kawaii onboarding flow."""
     user_data = {}
@@ -118,7 +237,7 @@ def welcome_message(waifu: EnhancedWaifuAssistant, storage_manager: StorageManag
     storage_manager.save_user_data(user_data)
     return user_data
 
-def handle_chat_loop(user_data: dict, waifu: EnhancedWaifuAssistant, ui_manager: UIManager) -> None:
+def handle_chat_loop(user_data: dict, waifu: EnhancedWaifuAssistant, ui_manager: UIManager, greetings: Optional[GreetingScheduler] = None) -> None:
     """Main chat loop with original kawaii styling and code review commands."""
     print(f"\n{Fore.YELLOW}Available commands:{Style.RESET_ALL}")
     print(f"{Fore.GREEN}!review [file_path]{Style.RESET_ALL} - Review a specific file")
@@ -127,9 +246,13 @@ def handle_chat_loop(user_data: dict, waifu: EnhancedWaifuAssistant, ui_manager:
     
     while True:
         try:
+            if greetings:
+                greetings.idle()
             user_input = ui_manager.get_input(
                 f"{Fore.CYAN}{user_data['waifu_name']}: {Fore.YELLOW}Type a command or message > {Style.RESET_ALL}"
             )
+            if greetings:
+                greetings.busy()
             
             if user_input.lower() in ['exit', 'quit']:
                 print(f"{Fore.CYAN}Sayonara! (｡♥‿♥｡){Style.RESET_ALL}")
@@ -229,9 +352,11 @@ def main():
         print(f"{Fore.GREEN}  !review [file_path]{Style.RESET_ALL} - For single file review")
         print(f"{Fore.GREEN}  !review-dir [directory_path]{Style.RESET_ALL} - For directory review\n")
 
-        # Location greeting
-        ai_comment_location_greeting = waifu.waifu_ai_comment(
-            f"Make a timely remark about the user's location {user_data['location']}. Keep it brief!"
+        # Location greeting, precomputed at the end of the last session when possible
+        prompts = welcome_back_prompts(user_data)
+        ttl_hours = config.get("greeting_ttl_hours")
+        ai_comment_location_greeting = get_greeting(
+            waifu, storage_manager, "location", prompts["location"], ttl_hours
         )
         print(f"{user_data['waifu_name']}: {ai_comment_location_greeting}\n")
 
@@ -259,8 +384,8 @@ def main():
         print(f"\n{user_data['waifu_name']}: {ai_comment_session_goals}\n")
 
         # Suggest new goals
-        ai_comment_new_goals = waifu.waifu_ai_comment(
-            "Make a brief quip about setting new goals. Then joke about living in the terminal."
+        ai_comment_new_goals = get_greeting(
+            waifu, storage_manager, "new_goals", prompts["new_goals"], ttl_hours
         )
         print(f"{user_data['waifu_name']}: {ai_comment_new_goals}\n")
 
@@ -282,8 +407,13 @@ def main():
         # Update mood and save data
         waifu.mood.update_mood({"time_since_break": 0, "code_quality": 0})
         storage_manager.save_user_data(user_data)
-        
-    handle_chat_loop(user_data, waifu, ui_manager)
+
+    # Prepare next session's greetings while the chat is idle, or at the latest on exit
+    greetings = GreetingScheduler(
+        waifu, storage_manager, user_data, config.get("greeting_ttl_hours")
+    )
+    handle_chat_loop(user_data, waifu, ui_manager, greetings)
+    greetings.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Storage management for the waifu assistant."""
 import os
 import json
+import hashlib
 from typing import Dict, List, Any
 from datetime import datetime
 
@@ -10,6 +11,8 @@ class StorageManager:
         self.data_dir = os.path.expanduser("~/.waifu_data")
         self.chat_file = os.path.join(self.data_dir, "chat_history.json")
         self.user_file = os.path.join(self.data_dir, "user_data.json")
+        self.greetings_file = os.path.join(self.data_dir, "greetings.json")
+        self.index_dir = os.path.join(self.data_dir, "indexes")
         self._ensure_data_dir()
         
     def _ensure_data_dir(self) -> None:
@@ -28,6 +31,11 @@ class StorageManager:
             "last_login": datetime.now().isoformat()
         }
 
+    def get_index_file(self, project_root: str) -> str:
+        """Returns the symbol index file path for a project root."""
+        key = hashlib.sha1(os.path.abspath(project_root).encode()).hexdigest()[:16]
+        return os.path.join(self.index_dir, f"{key}.json")
+
     def load_chat_history(self) -> List[Dict[str, str]]:
         """Loads chat history from storage."""
         if os.path.exists(self.chat_file):
@@ -40,6 +48,21 @@ class StorageManager:
         with open(self.chat_file, 'w') as f:
             json.dump(history, f, indent=4)
 
+    def load_greetings(self) -> Dict[str, Dict[str, str]]:
+        """Loads greetings precomputed for the next session."""
+        if os.path.exists(self.greetings_file):
+            try:
+                with open(self.greetings_file, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                return {}
+        return {}
+
+    def save_greetings(self, greetings: Dict[str, Dict[str, str]]) -> None:
+        """Saves greetings precomputed for the next session."""
+        with open(self.greetings_file, 'w') as f:
+            json.dump(greetings, f, indent=4)
+
     def load_user_data(self) -> Dict[str, Any]:
         """Loads user data from storage with defaults."""
         default_data = self._get_default_user_data()
@@ -1,23 +1,43 @@
 """User interface management for the waifu assistant."""
 import os
+import atexit
 import readline
 from typing import Optional
 from colorama import Fore, Style
+from .completion import Completer
 
 class UIManager:
     """Manages user interface interactions."""
     def __init__(self):
+        self.histfile = os.path.expanduser("~/.waifu_history")
+        self.completer = Completer()
         self.setup_readline()
 
     def setup_readline(self) -> None:
-        """Sets up readline with history."""
-        histfile = os.path.expanduser("~/.waifu_history")
+        """Sets up readline with persistent history and command/path completion."""
         try:
-            readline.read_history_file(histfile)
+            readline.read_history_file(self.histfile)
         except FileNotFoundError:
             pass
         readline.set_history_length(1000)
-        readline.parse_and_bind('tab: complete')
+        atexit.register(self.save_history)
+        atexit.register(self.completer.stop)
+
+        # Only split on whitespace so paths and !commands complete as whole words
+        readline.set_completer_delims(' \t\n')
+        readline.set_completer(self.completer.complete)
+        if 'libedit' in (readline.__doc__ or ''):
+            readline.parse_and_bind('bind ^I rl_complete')
+        else:
+            readline.parse_and_bind('tab: complete')
+        self.completer.start()
+
+    def save_history(self) -> None:
+        """Writes the input history back to disk."""
+        try:
+            readline.write_history_file(self.histfile)
+        except OSError:
+            pass
 
     def get_input(self, prompt: str, default: str = "") -> str:
         """Gets input from the user with history support and default value."""
@@ -0,0 +1,195 @@
+import os
+import readline
+from watchdog.events import (
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirMovedEvent,
+    FileCreatedEvent,
+    FileMovedEvent,
+)
+from waifu import completion
+from waifu.completion import Completer, PathTrie, PathTrieHandler, MAX_WATCHES
+from waifu.ui import UIManager
+
+
+def touch(root, rel_path):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+    return str(path)
+
+
+def make_trie(root):
+    trie = PathTrie(str(root))
+    trie.build()
+    return trie
+
+
+def test_complete_bisect_bounds(tmp_path):
+    for name in ["ab.py", "abc.py", "abd.py", "ac.py", "b.py"]:
+        touch(tmp_path, name)
+    trie = make_trie(tmp_path)
+    assert trie.complete("ab") == ["ab.py", "abc.py", "abd.py"]
+    assert trie.complete("ac") == ["ac.py"]
+    assert trie.complete("abz") == []
+    assert trie.complete("") == ["ab.py", "abc.py", "abd.py", "ac.py", "b.py"]
+
+
+def test_directories_get_a_trailing_slash(tmp_path):
+    touch(tmp_path, "src/pkg/mod.py")
+    touch(tmp_path, "setup.py")
+    trie = make_trie(tmp_path)
+    assert trie.complete("s") == ["setup.py", "src/"]
+    assert trie.complete("src/") == ["src/pkg/"]
+    assert trie.complete("./src/pkg/m") == ["./src/pkg/mod.py"]
+    assert trie.complete("missing/") == []
+
+
+def test_ignored_directories_are_skipped(tmp_path):
+    touch(tmp_path, ".git/HEAD")
+    touch(tmp_path, "node_modules/x.js")
+    touch(tmp_path, "main.py")
+    trie = make_trie(tmp_path)
+    assert trie.complete("") == ["main.py"]
+
+    trie.add(str(tmp_path / "venv"), True)
+    trie.add(str(tmp_path / ".venv" / "lib.py"), False)
+    assert trie.complete("") == ["main.py"]
+
+
+def test_add_and_remove(tmp_path):
+    trie = make_trie(tmp_path)
+    trie.add(str(tmp_path / "pkg" / "new.py"), False)
+    assert trie.complete("pkg/") == ["pkg/new.py"]
+    trie.remove(str(tmp_path / "pkg"))
+    assert trie.complete("") == []
+    trie.add(str(tmp_path.parent / "outside.py"), False)
+    assert trie.complete("") == []
+
+
+def test_watch_plan_avoids_ignored_dirs(tmp_path):
+    touch(tmp_path, "clean/a/b.py")
+    touch(tmp_path, "mixed/node_modules/x.js")
+    touch(tmp_path, "mixed/lib/c.py")
+    plan = dict(make_trie(tmp_path).watch_plan())
+    assert plan == {
+        str(tmp_path): False,
+        str(tmp_path / "clean"): True,
+        str(tmp_path / "mixed"): False,
+        str(tmp_path / "mixed" / "lib"): True,
+    }
+    assert len(plan) <= MAX_WATCHES
+
+
+def test_events_during_a_rebuild_are_replayed(tmp_path):
+    touch(tmp_path, "old.py")
+    completer = Completer(str(tmp_path))
+    completer._publish(make_trie(tmp_path))
+
+    # Start a rebuild, change things while the walk is "in progress", then publish
+    completer._rebuilding = True
+    rebuilt = make_trie(tmp_path)
+    completer.add_path(str(tmp_path / "new.py"), False)
+    completer.remove_path(str(tmp_path / "old.py"))
+    assert completer.trie.complete("") == ["new.py"]
+    completer._publish(rebuilt)
+
+    assert completer.trie is rebuilt
+    assert completer.trie.complete("") == ["new.py"]
+    assert completer._pending == []
+
+
+def test_events_before_first_build_are_replayed(tmp_path):
+    completer = Completer(str(tmp_path))
+    completer.add_path(str(tmp_path / "new.py"), False)
+    completer._publish(make_trie(tmp_path))
+    assert completer.trie.complete("") == ["new.py"]
+
+
+def test_unwatched_trees_rebuild_and_fall_back_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(completion, "MAX_WATCHED_DIRS", 0)
+    touch(tmp_path, "old.py")
+    completer = Completer(str(tmp_path))
+    completer._publish(completer._scan())
+    assert not completer._watch(completer.trie)
+
+    touch(tmp_path, "new.py")
+    assert completer.trie.complete("n") == []
+    assert completer.complete_path("n") == ["new.py"]
+    completer._rebuild()
+    assert completer.trie.complete("n") == ["new.py"]
+
+
+def test_handler_indexes_created_and_moved_directories(tmp_path):
+    completer = Completer(str(tmp_path))
+    completer._publish(make_trie(tmp_path))
+    handler = PathTrieHandler(completer)
+
+    touch(tmp_path, "newpkg/sub/mod.py")
+    handler.on_created(DirCreatedEvent(str(tmp_path / "newpkg")))
+    assert completer.trie.complete("newpkg/") == ["newpkg/sub/"]
+    assert completer.trie.complete("newpkg/sub/") == ["newpkg/sub/mod.py"]
+
+    touch(tmp_path.parent / f"{tmp_path.name}-outside", "lib/util.py")
+    touch(tmp_path.parent / f"{tmp_path.name}-outside", "node_modules/x.js")
+    os.rename(tmp_path.parent / f"{tmp_path.name}-outside", tmp_path / "moved")
+    handler.on_moved(DirMovedEvent(str(tmp_path / "elsewhere"), str(tmp_path / "moved")))
+    assert completer.trie.complete("moved/") == ["moved/lib/"]
+    assert completer.trie.complete("moved/lib/") == ["moved/lib/util.py"]
+
+    handler.on_moved(FileMovedEvent(
+        str(tmp_path / "newpkg/sub/mod.py"), str(tmp_path / "newpkg/sub/renamed.py")
+    ))
+    assert completer.trie.complete("newpkg/sub/") == ["newpkg/sub/renamed.py"]
+
+    handler.on_created(DirCreatedEvent(str(tmp_path / ".venv")))
+    handler.on_created(FileCreatedEvent(str(tmp_path / "top.py")))
+    assert completer.trie.complete("") == ["moved/", "newpkg/", "top.py"]
+
+    handler.on_deleted(DirDeletedEvent(str(tmp_path / "newpkg")))
+    assert completer.trie.complete("") == ["moved/", "top.py"]
+
+
+def test_history_is_persisted(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    readline.clear_history()
+    ui = UIManager()
+    ui.completer.stop()
+    readline.add_history("!review main.py")
+    ui.save_history()
+    assert "!review main.py" in (tmp_path / ".waifu_history").read_text()
+
+    readline.clear_history()
+    ui = UIManager()
+    ui.completer.stop()
+    length = readline.get_current_history_length()
+    history = [readline.get_history_item(i) for i in range(1, length + 1)]
+    assert history == ["!review main.py"]
+    readline.clear_history()
+
+
+def test_broad_roots_are_not_indexed():
+    assert not Completer(os.path.expanduser("~")).should_index()
+    assert not Completer(os.sep).should_index()
+
+
+def test_candidates_dispatch(tmp_path):
+    touch(tmp_path, "src/main.py")
+    completer = Completer(str(tmp_path))
+    completer.trie = make_trie(tmp_path)
+    assert completer.candidates("!rev", 0, "!rev") == ["!review", "!review-dir"]
+    assert completer.candidates("ex", 0, "ex") == ["exit"]
+    assert completer.candidates("!review sr", 8, "sr") == ["src/"]
+    assert completer.candidates("!review [src/m", 8, "[src/m") == ["[src/main.py"]
+    assert completer.candidates("!review-dir s", 12, "s") == ["src/"]
+    assert completer.candidates("hello sr", 6, "sr") == []
+
+
+def test_paths_outside_the_project_use_the_disk(tmp_path):
+    touch(tmp_path, "project/main.py")
+    touch(tmp_path, "sibling/other.py")
+    completer = Completer(str(tmp_path / "project"))
+    completer.trie = make_trie(tmp_path / "project")
+    assert completer.complete_path("../sib") == ["../sibling/"]
+    assert completer.complete_path(f"{tmp_path}/sib") == [f"{tmp_path}/sibling/"]
@@ -0,0 +1,162 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+import pytest
+from waifu.config import Config
+from waifu.enhanced import EnhancedWaifuAssistant
+from waifu.main import (
+    GreetingScheduler,
+    get_greeting,
+    precompute_greetings,
+    welcome_back_prompts,
+)
+from waifu.storage import StorageManager
+
+USER_DATA = {"location": "Tokyo"}
+
+
+def mock_client(content="live"):
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content=content))]
+    )
+    return client
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return StorageManager()
+
+
+def make_waifu(storage, client=None):
+    return EnhancedWaifuAssistant(client or mock_client(), storage, MagicMock())
+
+
+def store(storage, key, text="cached", created=None, prompt=None):
+    prompt = prompt or welcome_back_prompts(USER_DATA)[key]
+    created = created or datetime.now().isoformat()
+    storage.save_greetings({key: {"prompt": prompt, "text": text, "created": created}})
+    return prompt
+
+
+def test_precompute_stores_all_prompts(storage):
+    precompute_greetings(make_waifu(storage, mock_client("ready")), storage, USER_DATA)
+    greetings = storage.load_greetings()
+    prompts = welcome_back_prompts(USER_DATA)
+    assert set(greetings) == set(prompts)
+    for key, prompt in prompts.items():
+        assert greetings[key]["prompt"] == prompt
+        assert greetings[key]["text"] == "ready"
+    # Generation leaves the chat history alone
+    assert storage.load_chat_history() == []
+
+
+def test_fresh_greeting_is_used_once(storage):
+    client = mock_client()
+    waifu = make_waifu(storage, client)
+    prompt = store(storage, "location")
+
+    assert get_greeting(waifu, storage, "location", prompt, 12) == "cached"
+    client.chat.completions.create.assert_not_called()
+    assert storage.load_chat_history()[-2:] == [
+        {"role": "user", "content": prompt},
+        {"role": "assistant", "content": "cached"},
+    ]
+
+    assert storage.load_greetings() == {}
+    assert get_greeting(waifu, storage, "location", prompt, 12) == "live"
+
+
+def test_stale_greeting_falls_back_to_live(storage):
+    created = (datetime.now() - timedelta(hours=13)).isoformat()
+    prompt = store(storage, "location", created=created)
+    assert get_greeting(make_waifu(storage), storage, "location", prompt, 12) == "live"
+    assert storage.load_greetings() == {}
+
+
+def test_prompt_mismatch_falls_back_to_live(storage):
+    store(storage, "location", prompt="Remark about Osaka")
+    prompt = welcome_back_prompts(USER_DATA)["location"]
+    assert get_greeting(make_waifu(storage), storage, "location", prompt, 12) == "live"
+
+
+@pytest.mark.parametrize("created", ["yesterday", 12345])
+def test_malformed_created_falls_back_to_live(storage, created):
+    prompt = store(storage, "location", created=created)
+    assert get_greeting(make_waifu(storage), storage, "location", prompt, 12) == "live"
+
+
+def test_precompute_keeps_greetings_finished_before_a_failure(storage):
+    client = mock_client("ready")
+    client.chat.completions.create.side_effect = [
+        client.chat.completions.create.return_value,
+        RuntimeError("timeout"),
+    ]
+    precompute_greetings(make_waifu(storage, client), storage, USER_DATA)
+    assert list(storage.load_greetings()) == ["location"]
+
+
+def test_input_resets_the_idle_timer(storage):
+    scheduler = GreetingScheduler(make_waifu(storage), storage, USER_DATA, 12, idle_delay=0.3)
+    scheduler.idle()
+    time.sleep(0.1)
+    scheduler.busy()
+    time.sleep(0.4)
+    assert storage.load_greetings() == {}
+
+    scheduler.idle()
+    time.sleep(0.6)
+    assert scheduler.is_current()
+    scheduler.busy()
+
+
+def test_exit_regenerates_greetings_from_an_earlier_session(storage):
+    old = (datetime.now() - timedelta(minutes=5)).isoformat()
+    for key in welcome_back_prompts(USER_DATA):
+        store(storage, key, created=old)
+    client = mock_client("new")
+    scheduler = GreetingScheduler(make_waifu(storage, client), storage, USER_DATA, 12)
+    assert not scheduler.is_current()
+
+    assert scheduler.finish(timeout=2)
+    greetings = storage.load_greetings()
+    assert {entry["text"] for entry in greetings.values()} == {"new"}
+    assert scheduler.is_current()
+
+
+def test_exit_after_idle_precompute_makes_no_more_calls(storage):
+    client = mock_client("ready")
+    scheduler = GreetingScheduler(make_waifu(storage, client), storage, USER_DATA, 12, idle_delay=0)
+    scheduler.idle()
+    assert scheduler.finish(timeout=2)
+    calls = client.chat.completions.create.call_count
+    assert scheduler.finish(timeout=2)
+    assert client.chat.completions.create.call_count == calls
+
+
+def test_exit_drops_slow_precompute(storage):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_create(**kwargs):
+        started.set()
+        release.wait(5)
+
+    client = mock_client()
+    client.chat.completions.create.side_effect = slow_create
+    scheduler = GreetingScheduler(make_waifu(storage, client), storage, USER_DATA, 12)
+    try:
+        assert not scheduler.finish(timeout=0.2)
+        assert started.is_set()
+        assert storage.load_greetings() == {}
+    finally:
+        release.set()
+
+
+def test_bad_greeting_ttl_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("GREETING_TTL_HOURS", "half a day")
+    assert Config().greeting_ttl_hours == 12.0
+    monkeypatch.setenv("GREETING_TTL_HOURS", "1.5")
+    assert Config().greeting_ttl_hours == 1.5
@@ -0,0 +1,178 @@
+import os
+import json
+from unittest.mock import MagicMock
+from waifu.enhanced import EnhancedWaifuAssistant
+from waifu.storage import StorageManager
+from waifu import index as index_module
+from waifu.index import ProjectIndex, INDEX_VERSION, find_project_root, is_broad_root
+
+
+def write(root, rel_path, source):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return str(path)
+
+
+def make_index(root):
+    index = ProjectIndex(str(root), str(root / ".index" / "index.json"))
+    index.refresh()
+    return index
+
+
+UTIL = 'def helper(x: int) -> int:\n    """Help."""\n    return x\n'
+
+
+def test_from_package_import_submodule(tmp_path):
+    write(tmp_path, "pkg/__init__.py", "")
+    write(tmp_path, "pkg/util.py", UTIL)
+    main = write(tmp_path, "pkg/main.py", "from pkg import util\nutil.helper(1)\n")
+    assert make_index(tmp_path).context_for(main) == (
+        "# pkg.util\ndef helper(x: int) -> int  # Help."
+    )
+
+
+def test_relative_import_of_submodule_from_package(tmp_path):
+    write(tmp_path, "pkg/__init__.py", "")
+    write(tmp_path, "pkg/util.py", UTIL)
+    main = write(tmp_path, "pkg/main.py", "from . import util\nutil.helper(1)\n")
+    assert "def helper(x: int) -> int" in make_index(tmp_path).context_for(main)
+
+
+def test_relative_import_levels(tmp_path):
+    write(tmp_path, "pkg/__init__.py", "")
+    write(tmp_path, "pkg/util.py", UTIL)
+    write(tmp_path, "pkg/sub/__init__.py", "from ..util import helper\nhelper(1)\n")
+    main = write(tmp_path, "pkg/sub/mod.py", "from ..util import helper\nhelper(1)\n")
+    index = make_index(tmp_path)
+    assert "# pkg.util" in index.context_for(main)
+    assert "# pkg.util" in index.context_for(str(tmp_path / "pkg/sub/__init__.py"))
+
+
+def test_unused_import_is_not_rendered(tmp_path):
+    write(tmp_path, "pkg/__init__.py", "")
+    write(tmp_path, "pkg/util.py", UTIL)
+    main = write(tmp_path, "pkg/main.py", "from pkg.util import helper\n")
+    assert make_index(tmp_path).context_for(main) == ""
+
+
+def test_only_called_methods_are_rendered(tmp_path):
+    write(tmp_path, "shop.py", (
+        "class Cart:\n"
+        '    """A cart."""\n'
+        "    def add(self, item: str) -> None:\n"
+        "        pass\n"
+        "    def clear(self) -> None:\n"
+        "        pass\n"
+    ))
+    main = write(tmp_path, "main.py", "from shop import Cart\nCart().add('x')\n")
+    assert make_index(tmp_path).context_for(main) == (
+        "# shop\nclass Cart  # A cart.\n    def add(self, item: str) -> None"
+    )
+
+
+def test_unchanged_files_are_not_rebuilt(tmp_path):
+    path = write(tmp_path, "util.py", UTIL)
+    index = make_index(tmp_path)
+    assert index.refresh() == 0
+
+    # Touched but identical content is skipped by the hash check
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert index.refresh() == 0
+    assert index.files["util.py"]["mtime"] == stat.st_mtime_ns + 10**9
+
+    write(tmp_path, "util.py", UTIL + "def other():\n    pass\n")
+    assert index.refresh() == 1
+    assert "other" in index.files["util.py"]["symbols"]
+
+
+def test_refresh_drops_deleted_files(tmp_path):
+    path = write(tmp_path, "util.py", UTIL)
+    index = make_index(tmp_path)
+    os.remove(path)
+    index.refresh()
+    assert index.files == {}
+    assert "util" not in index.modules
+
+
+def test_save_and_load_round_trip(tmp_path):
+    write(tmp_path, "util.py", UTIL)
+    index = make_index(tmp_path)
+    index.save()
+    reloaded = ProjectIndex(str(tmp_path), index.index_file)
+    assert reloaded.files == index.files
+    assert reloaded.refresh() == 0
+
+
+def test_load_ignores_other_root_or_version(tmp_path):
+    index_file = tmp_path / "index.json"
+    files = {"util.py": {"module": "util"}}
+    index_file.write_text(json.dumps(
+        {"version": INDEX_VERSION, "root": "/elsewhere", "files": files}
+    ))
+    assert ProjectIndex(str(tmp_path), str(index_file)).files == {}
+    index_file.write_text(json.dumps(
+        {"version": INDEX_VERSION + 1, "root": str(tmp_path), "files": files}
+    ))
+    assert ProjectIndex(str(tmp_path), str(index_file)).files == {}
+
+
+def test_syntax_error_indexes_without_symbols(tmp_path):
+    write(tmp_path, "broken.py", "def (:\n")
+    index = make_index(tmp_path)
+    assert index.files["broken.py"]["symbols"] == {}
+
+
+def test_review_context_reuses_index_per_project(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    project = tmp_path / "project"
+    write(project, "pyproject.toml", "")
+    write(project, "util.py", UTIL)
+    main = write(project, "main.py", "from util import helper\nhelper(1)\n")
+
+    waifu = EnhancedWaifuAssistant(MagicMock(), StorageManager(), MagicMock())
+    assert "def helper(x: int) -> int" in waifu.get_review_context(main)
+    assert waifu.get_project_index(main) is waifu.project_indexes[str(project)]
+    assert os.path.exists(waifu.storage.get_index_file(str(project)))
+    assert waifu.get_review_context(str(project / "missing.py")) == ""
+
+
+def test_unreadable_file_is_skipped(tmp_path, monkeypatch):
+    write(tmp_path, "util.py", UTIL)
+    secret = write(tmp_path, "secret.py", UTIL)
+
+    def guarded_open(path, *args, **kwargs):
+        if path == secret:
+            raise PermissionError(path)
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(index_module, "open", guarded_open, raising=False)
+    index = make_index(tmp_path)
+    assert set(index.files) == {"util.py"}
+
+
+def test_project_root_guards_broad_directories(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    write(tmp_path, ".git/HEAD", "")
+    write(tmp_path, "project/pyproject.toml", "")
+    assert find_project_root(str(tmp_path / "project" / "pkg" / "x.py")) == str(
+        tmp_path / "project"
+    )
+    assert find_project_root(str(tmp_path / "script.py")) is None
+    assert find_project_root(str(tmp_path / "loose" / "script.py")) is None
+    assert is_broad_root(str(tmp_path)) and is_broad_root(os.sep)
+
+
+def test_files_outside_projects_index_only_their_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    loose = tmp_path / "home" / "scripts"
+    write(loose, "util.py", UTIL)
+    write(loose, "deep/other.py", UTIL)
+    main = write(loose, "main.py", "from util import helper\nhelper(1)\n")
+
+    waifu = EnhancedWaifuAssistant(MagicMock(), StorageManager(), MagicMock())
+    assert "def helper(x: int) -> int" in waifu.get_review_context(main)
+    index = waifu.project_indexes[str(loose)]
+    assert not index.recursive
+    assert set(index.files) == {"util.py", "main.py"}